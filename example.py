@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import configparser
 import os
@@ -6,45 +7,76 @@ from renogybt import EcoWorthyClient, DCChargerClient, InverterClient, RoverClie
 
 logging.basicConfig(level=logging.INFO)
 
-config_file = sys.argv[1] if len(sys.argv) > 1 else 'config.ini'
-config_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), config_file)
-config = configparser.ConfigParser(os.environ, inline_comment_prefixes=('#'))
-config.read(config_path)
-data_logger: DataLogger = DataLogger(config)
+def load_config(config_file):
+    config_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), config_file)
+    config = configparser.ConfigParser(os.environ, inline_comment_prefixes=('#'))
+    config.read(config_path)
+    return config
 
-# the callback func when you receive data
-def on_data_received(client, data):
-    filtered_data = Utils.filter_fields(data, config['data']['fields'])
-    logging.info(f" => {filtered_data}")
+def create_client(config):
+    data_logger: DataLogger = DataLogger(config)
+
+    # parse config once here instead of per received notification
+    fields = [x.strip() for x in config['data']['fields'].split(',')] if len(config['data']['fields']) > 0 else []
+    polling_enabled = config['data'].getboolean('enable_polling')
+
+    # the enabled sinks never change at runtime, so resolve them once
+    sinks = []
     if config['remote_logging'].getboolean('enabled'):
-        data_logger.log_remote(json_data=filtered_data)
+        sinks.append(data_logger.log_remote)
     if config['mqtt'].getboolean('enabled'):
-        data_logger.log_mqtt(json_data=filtered_data)
+        sinks.append(data_logger.log_mqtt)
     if config['pvoutput'].getboolean('enabled') and config['device']['type'] == 'RNG_CTRL':
-        data_logger.log_pvoutput(json_data=filtered_data)
+        sinks.append(data_logger.log_pvoutput)
     if config['influxdb2'].getboolean('enabled'):
-        data_logger.log_influxdb2(json_data=filtered_data)
+        sinks.append(data_logger.log_influxdb2)
     if config['influxdb3'].getboolean('enabled'):
-        data_logger.log_influxdb3(json_data=filtered_data)
-    if not config['data'].getboolean('enable_polling'):
-        client.stop()
-
-# error callback
-def on_error(client, error):
-    logging.error(f"on_error: {error}")
-
-# start client
-if config['device']['type'] == 'RNG_CTRL':
-    RoverClient(config, on_data_received, on_error).start()
-elif config['device']['type'] == 'RNG_CTRL_HIST':
-    RoverHistoryClient(config, on_data_received, on_error).start()
-elif config['device']['type'] == 'RNG_BATT':
-    BatteryClient(config, on_data_received, on_error).start()
-elif config['device']['type'] == 'RNG_INVT':
-    InverterClient(config, on_data_received, on_error).start()
-elif config['device']['type'] == 'RNG_DCC':
-    DCChargerClient(config, on_data_received, on_error).start()
-elif config['device']['type'] == 'EW_BAT':
-    EcoWorthyClient(config, on_data_received, on_error).start()
-else:
-    logging.error("unknown device type")
+        sinks.append(data_logger.log_influxdb3)
+
+    # the callback func when you receive data
+    def on_data_received(client, data):
+        filtered_data = Utils.filter_fields(data, fields)
+        logging.info(f" => {filtered_data}")
+        if sinks:
+            try:
+                # all sinks run concurrently off the BLE event loop
+                asyncio.get_running_loop().create_task(data_logger.log_all(filtered_data, sinks))
+            except RuntimeError:
+                for sink in sinks:
+                    sink(filtered_data)
+        if not polling_enabled:
+            client.stop()
+
+    # error callback
+    def on_error(client, error):
+        logging.error(f"on_error: {error}")
+
+    device_type = config['device']['type']
+    if device_type == 'RNG_CTRL':
+        return RoverClient(config, on_data_received, on_error)
+    elif device_type == 'RNG_CTRL_HIST':
+        return RoverHistoryClient(config, on_data_received, on_error)
+    elif device_type == 'RNG_BATT':
+        return BatteryClient(config, on_data_received, on_error)
+    elif device_type == 'RNG_INVT':
+        return InverterClient(config, on_data_received, on_error)
+    elif device_type == 'RNG_DCC':
+        return DCChargerClient(config, on_data_received, on_error)
+    elif device_type == 'EW_BAT':
+        return EcoWorthyClient(config, on_data_received, on_error)
+    else:
+        logging.error("unknown device type")
+        return None
+
+async def main():
+    # one config file per device; all clients share the event loop so BLE
+    # connect/poll cycles run concurrently instead of N x round-trip time
+    config_files = sys.argv[1:] if len(sys.argv) > 1 else ['config.ini']
+    devices = [client for client in (create_client(load_config(f)) for f in config_files) if client]
+    results = await asyncio.gather(*(device.run() for device in devices), return_exceptions=True)
+    for device, result in zip(devices, results):
+        if isinstance(result, Exception):
+            logging.error(f"{device.config['device']['alias']} failed: {result}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
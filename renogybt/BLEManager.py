@@ -7,15 +7,21 @@ DISCOVERY_TIMEOUT = 5 # max wait time to complete the bluetooth scanning (second
 CONNECTION_TIMEOUT = 10 # max wait time for BLE connection (seconds)
 
 class BLEManager:
-    def __init__(self, mac_address, alias, on_data, on_connect_fail, write_service_uuid, notify_char_uuid, write_char_uuid):
+    def __init__(self, mac_address, alias, on_data, on_connect_fail, write_service_uuid, notify_char_uuid, write_char_uuid, adapter='hci0', conn_interval_min=None, conn_interval_max=None, on_disconnect=None):
         self.mac_address = mac_address
         self.device_alias = alias
+        self.adapter = adapter
+        self.conn_interval_min = conn_interval_min
+        self.conn_interval_max = conn_interval_max
         self.data_callback = on_data
         self.connect_fail_callback = on_connect_fail
-        self.write_service_uuid = write_service_uuid
-        self.notify_char_uuid = notify_char_uuid
-        self.write_char_uuid = write_char_uuid
+        self.disconnect_callback = on_disconnect
+        # lowercase once so the UUID-indexed service collection hits on the first probe
+        self.write_service_uuid = write_service_uuid.lower()
+        self.notify_char_uuid = notify_char_uuid.lower()
+        self.write_char_uuid = write_char_uuid.lower()
         self.write_char_handle = None
+        self.write_with_response = False
         self.device: BLEDevice = None
         self.client: BleakClient = None
         self.discovered_devices = []
@@ -23,19 +29,55 @@ class BLEManager:
     async def discover(self):
         mac_address = self.mac_address.upper()
         logging.info("Starting discovery...")
-        self.discovered_devices = await BleakScanner.discover(timeout=DISCOVERY_TIMEOUT)
-        logging.info("Devices found: %s", len(self.discovered_devices))
+        found = asyncio.Event()
 
-        for dev in self.discovered_devices:
+        # match advertisements as they arrive so we can stop as soon as the
+        # device shows up instead of always waiting out the full scan window
+        def detection_callback(dev, advertisement_data):
             if dev.address != None and (dev.address.upper() == mac_address or (dev.name and dev.name.strip() == self.device_alias)):
                 logging.info(f"Found matching device {dev.name} => {dev.address}")
                 self.device = dev
+                found.set()
+
+        scanner = BleakScanner(detection_callback=detection_callback)
+        await scanner.start()
+        try:
+            await asyncio.wait_for(found.wait(), timeout=DISCOVERY_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await scanner.stop()
+        self.discovered_devices = scanner.discovered_devices
+        logging.info("Devices found: %s", len(self.discovered_devices))
+
+    def request_connection_interval(self):
+        # Best effort, Linux/BlueZ only: the kernel negotiates new connections with
+        # the debugfs interval bounds (units of 1.25 ms), so set them before connect.
+        # A lower interval cuts notification round-trip latency at the cost of radio power.
+        if self.conn_interval_min is None and self.conn_interval_max is None:
+            return
+        if not sys.platform.startswith('linux'):
+            logging.debug("Connection interval tuning is only supported on Linux/BlueZ")
+            return
+        try:
+            for name, interval_ms in (('conn_min_interval', self.conn_interval_min), ('conn_max_interval', self.conn_interval_max)):
+                if interval_ms is None:
+                    continue
+                with open(f"/sys/kernel/debug/bluetooth/{self.adapter}/{name}", 'w') as f:
+                    f.write(str(max(6, round(interval_ms / 1.25))))
+            logging.info(f"Requested connection interval {self.conn_interval_min}-{self.conn_interval_max} ms on {self.adapter}")
+        except OSError as e:
+            logging.warning(f"Could not set connection interval (needs root/debugfs): {e}")
+
+    def _on_disconnected(self, client):
+        logging.warning(f"Device disconnected: {self.mac_address}")
+        if self.disconnect_callback:
+            self.disconnect_callback()
 
     async def connect(self):
-        if not self.device:
-            self.client = BleakClient(self.mac_address)
-        else:
-            self.client = BleakClient(self.device)
+        self.request_connection_interval()
+        # reuse the BLEDevice from the first discovery so reconnects skip the scan phase
+        self.client = BleakClient(self.device or self.mac_address, disconnected_callback=self._on_disconnected)
         try:
             # Add timeout to connection attempt
             await asyncio.wait_for(self.client.connect(), timeout=CONNECTION_TIMEOUT)
@@ -45,14 +87,19 @@ class BLEManager:
                 self.connect_fail_callback("Connection failed - client not connected")
                 return
 
-            for service in self.client.services:
-                for characteristic in service.characteristics:
-                    if characteristic.uuid == self.notify_char_uuid:
-                        await self.client.start_notify(characteristic,  self.notification_callback)
-                        logging.debug(f"subscribed to notification {characteristic.uuid}")
-                    if characteristic.uuid == self.write_char_uuid and service.uuid == self.write_service_uuid:
-                        self.write_char_handle = characteristic.handle
-                        logging.debug(f"found write characteristic {characteristic.uuid}, service {service.uuid}")
+            # the service collection is UUID-indexed, no need to walk every characteristic
+            notify_char = self.client.services.get_characteristic(self.notify_char_uuid)
+            if notify_char:
+                await self.client.start_notify(notify_char, self.notification_callback)
+                logging.debug(f"subscribed to notification {notify_char.uuid}")
+            write_service = self.client.services.get_service(self.write_service_uuid)
+            write_char = write_service.get_characteristic(self.write_char_uuid) if write_service else None
+            if write_char:
+                self.write_char_handle = write_char.handle
+                # prefer write-with-response when the peripheral supports it: the GATT
+                # ack replaces any fixed settle delay and surfaces errors immediately
+                self.write_with_response = 'write' in write_char.properties
+                logging.debug(f"found write characteristic {write_char.uuid}, service {write_service.uuid}, with response: {self.write_with_response}")
 
         except asyncio.TimeoutError:
             logging.error(f"Connection timeout after {CONNECTION_TIMEOUT} seconds")
@@ -65,24 +112,14 @@ class BLEManager:
         logging.debug("notification_callback")
         await self.data_callback(data)
 
-    async def characteristic_write_value(self, data):
-        try:
-            logging.debug(f'writing to {self.write_char_uuid} {data}')
-            await self.client.write_gatt_char(self.write_char_handle, bytearray(data), response=False)
-            logging.debug('characteristic_write_value succeeded')
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            logging.error(f'characteristic_write_value failed {e}')
-            raise  # Re-raise exception to propagate error up
-
     async def characteristic_write_bytes(self, data):
         try:
-            logging.debug(f'writing to {self.write_char_uuid} {data}')
-            await self.client.write_gatt_char(self.write_char_handle, data, response=False)
-            logging.debug('characteristic_write_value succeeded')
-            await asyncio.sleep(0.5)
+            logging.debug('writing to %s %s', self.write_char_uuid, data)
+            # bleak accepts any bytes-like object, no bytearray copy needed
+            await self.client.write_gatt_char(self.write_char_handle, data, response=self.write_with_response)
+            logging.debug('characteristic_write_bytes succeeded')
         except Exception as e:
-            logging.error(f'characteristic_write_value failed {e}')
+            logging.error(f'characteristic_write_bytes failed {e}')
             raise  # Re-raise exception to propagate error up
 
     async def disconnect(self):
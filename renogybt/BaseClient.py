@@ -1,49 +1,72 @@
 import asyncio
 import configparser
 import logging
-import traceback
+import struct
 from .BLEManager import BLEManager
-from .Utils import bytes_to_int, crc16_modbus, int_to_bytes
+from .Utils import crc16_modbus
 
 # Base class that works with all Renogy family devices
 # Should be extended by each client with its own parsers and section definitions
 # Section example: {'register': 5000, 'words': 8, 'parser': self.parser_func}
 
-ALIAS_PREFIXES = ['BT-TH', 'RNGRBP', 'BTRIC']
+ALIAS_PREFIXES = ('BT-TH', 'RNGRBP', 'BTRIC')
 WRITE_SERVICE_UUID = "0000ffd0-0000-1000-8000-00805f9b34fb"
 NOTIFY_CHAR_UUID = "0000fff1-0000-1000-8000-00805f9b34fb"
 WRITE_CHAR_UUID  = "0000ffd1-0000-1000-8000-00805f9b34fb"
 READ_TIMEOUT = 15 # (seconds)
 READ_SUCCESS = 3
 READ_ERROR = 131
+RX_QUEUE_SIZE = 64 # max buffered notifications before oldest frames are dropped
+DELAY_BACKOFF_MIN = 0.05 # first inter-section delay tried after a timeout (seconds)
+DELAY_BACKOFF_CAP = 0.5 # adaptive delay never exceeds the old fixed gap (seconds)
+DELAY_RECOVERY_READS = 10 # consecutive good reads before the delay is halved again
+_REQ_HEADER = struct.Struct('>BBHH') # device_id, function, register, words
 
 class BaseClient:
     def __init__(self, config):
         self.config: configparser.ConfigParser = config
         self.ble_manager = None
         self.device = None
-        self.poll_timer = None
-        self.read_timeout = None
         self.data = {}
+        # snapshot config into plain attributes; configparser access does a
+        # dict walk + type coercion per call, not something for the poll path
         self.device_id = self.config['device'].getint('device_id')
+        self.mac_addr = self.config['device']['mac_addr']
+        self.alias = self.config['device']['alias']
+        self.temperature_unit = self.config['data'].get('temperature_unit', 'C')
+        self.polling_enabled = self.config['data'].getboolean('enable_polling', fallback=False)
+        self.poll_interval = self.config['data'].getint('poll_interval', fallback=0)
+        self.inter_section_delay = self.config['device'].getfloat('inter_section_delay_ms', fallback=0) / 1000.0
+        # adaptive inter-command gap: starts at the configured floor, doubles
+        # on read timeouts and decays back after sustained good reads
+        self._current_delay = self.inter_section_delay
+        self._successive_reads = 0
+        self._had_read_success = False
         self.sections = []
-        self.section_index = 0
-        self.read_timeout_task = None
+        self._section_future = None
+        self._sections_prepared = False
+        self._needs_reconnect = False
+        self._rx_queue = None
+        self._rx_task = None
         self._stop_event = None
         self._running = False
-        logging.info(f"Init {self.__class__.__name__}: {self.config['device']['alias']} => {self.config['device']['mac_addr']}")
+        logging.info(f"Init {self.__class__.__name__}: {self.alias} => {self.mac_addr}")
 
     def start(self):
         """Start the client using high-level asyncio APIs."""
         try:
             # Use asyncio.run() for proper event loop management
-            asyncio.run(self._run_with_timeout())
+            asyncio.run(self.run())
         except KeyboardInterrupt:
             logging.warning("KeyboardInterrupt received")
             self.__on_error("KeyboardInterrupt")
         except Exception as e:
             self.__on_error(e)
-    
+
+    async def run(self):
+        """Async entry point, allows multiple clients to share one event loop."""
+        await self._run_with_timeout()
+
     async def _run_with_timeout(self):
         """Run the main task with timeout using high-level asyncio APIs."""
         try:
@@ -60,40 +83,114 @@ class BaseClient:
         """Main async task that handles the connection and operation lifecycle."""
         self._running = True
         self._stop_event = asyncio.Event()
+        # notifications are queued by the BLE callback and handled by a dedicated
+        # consumer, so a slow parser or data callback can't back up the BLE stack
+        self._rx_queue = asyncio.Queue(maxsize=RX_QUEUE_SIZE)
+        self._rx_task = asyncio.create_task(self._consume_notifications())
         try:
             await self.connect()
             # Keep the task running until explicitly stopped
             await self._stop_event.wait()
         finally:
+            self._rx_task.cancel()
             await self._cleanup()
             self._running = False
 
+    async def _enqueue_notification(self, response):
+        if self._rx_queue.full():
+            self._rx_queue.get_nowait()
+            logging.warning("notification queue full, dropping oldest frame")
+        self._rx_queue.put_nowait(response)
+
+    async def _consume_notifications(self):
+        while True:
+            response = await self._rx_queue.get()
+            try:
+                await self.on_data_received(response)
+            except Exception as e:
+                logging.error(f"error while handling notification: {e}")
+
+    def _prepare_sections(self):
+        if self._sections_prepared:
+            return
+        try:
+            # a response must fit one notification (3 header bytes + payload + 2 crc)
+            # and a single Modbus read maxes out at 125 registers
+            max_words = min(125, (self.ble_manager.client.mtu_size - 8) // 2)
+        except Exception:
+            max_words = 0
+        self._coalesce_sections(max_words)
+        self._build_frames()
+        self._sections_prepared = True
+
+    def _coalesce_sections(self, max_words):
+        # devices with contiguous register maps answer several sections in one
+        # round trip; remember (offset, words, parser) so each original parser
+        # still sees only its own slice of the combined payload
+        if max_words <= 0:
+            return
+        merged = []
+        for section in self.sections:
+            last = merged[-1] if merged else None
+            if (last is not None and section['parser'] is not None and
+                    last['register'] + last['words'] == section['register'] and
+                    last['words'] + section['words'] <= max_words):
+                last['_parsers'].append((last['words'] * 2, section['words'], section['parser']))
+                last['words'] += section['words']
+            else:
+                merged.append({'register': section['register'], 'words': section['words'],
+                               'parser': section['parser'],
+                               '_parsers': [(0, section['words'], section['parser'])]})
+        if len(merged) < len(self.sections):
+            logging.info(f"Coalesced {len(self.sections)} sections into {len(merged)} read requests")
+        self.sections = merged
+
+    def _parse_section(self, section, response):
+        for offset, words, parser in section.get('_parsers', [(0, section['words'], section['parser'])]):
+            if parser is None:
+                continue
+            if offset == 0 and words == section['words']:
+                self.__safe_parser(parser, response)
+            else:
+                # rebuild a response structurally identical to a standalone read:
+                # own byte count in the header, own payload slice and a recomputed
+                # CRC tail, so parsers deriving counts from len() stay correct
+                sub = bytes((response[0], response[1], words * 2)) + response[3 + offset: 3 + offset + words * 2]
+                self.__safe_parser(parser, sub + crc16_modbus(sub))
+
+    def _build_frames(self):
+        # sections, device_id and function code are fixed at construction, so the
+        # request frame (incl. CRC) for each section can be computed once and reused
+        for section in self.sections:
+            if '_frame' not in section:
+                section['_frame'] = bytes(self.create_generic_read_request(
+                    self.device_id, 3, section['register'], section['words']
+                ))
+
     async def connect(self):
         try:
-            self.ble_manager = BLEManager(mac_address=self.config['device']['mac_addr'], alias=self.config['device']['alias'], on_data=self.on_data_received, on_connect_fail=self.__on_connect_fail, notify_char_uuid=NOTIFY_CHAR_UUID, write_char_uuid=WRITE_CHAR_UUID, write_service_uuid=WRITE_SERVICE_UUID)
+            self.ble_manager = BLEManager(mac_address=self.mac_addr, alias=self.alias, on_data=self._enqueue_notification, on_connect_fail=self.__on_connect_fail, notify_char_uuid=NOTIFY_CHAR_UUID, write_char_uuid=WRITE_CHAR_UUID, write_service_uuid=WRITE_SERVICE_UUID, adapter=self.config['device'].get('adapter', 'hci0'), conn_interval_min=self.config['device'].getfloat('conn_interval_min', fallback=None), conn_interval_max=self.config['device'].getfloat('conn_interval_max', fallback=None), on_disconnect=self._on_disconnect)
+
+            # resolve the device with one scan window up front: connecting by
+            # bare MAC makes bleak run its own scan, and a failed attempt used
+            # to be followed by a second full discovery on top of it
+            await self.ble_manager.discover()
+
+            if not self.ble_manager.device:
+                logging.error(f"Device not found: {self.alias} => {self.mac_addr}, please check the details provided.")
+                candidate = next((dev for dev in self.ble_manager.discovered_devices if dev.name != None and dev.name.startswith(ALIAS_PREFIXES)), None)
+                if candidate:
+                    logging.info(f"Possible device found! ====> {candidate.name} > [{candidate.address}]")
+                self.__on_error("Device not found after discovery")
+                return
 
             await self.ble_manager.connect()
             if self.ble_manager.client and self.ble_manager.client.is_connected:
-                await self.read_section()
+                await self.read()
+                await self.check_polling()
             else:
-                logging.warning("Was not able to connect to MAC prior to discover - going long route.")
-
-                await self.ble_manager.discover()
-
-                if not self.ble_manager.device:
-                    logging.error(f"Device not found: {self.config['device']['alias']} => {self.config['device']['mac_addr']}, please check the details provided.")
-                    for dev in self.ble_manager.discovered_devices:
-                        if dev.name != None and dev.name.startswith(tuple(ALIAS_PREFIXES)):
-                            logging.info(f"Possible device found! ====> {dev.name} > [{dev.address}]")
-                    self.__on_error("Device not found after discovery")
-                    return
-                else:
-                    await self.ble_manager.connect()
-                    if self.ble_manager.client and self.ble_manager.client.is_connected: 
-                        await self.read_section()
-                    else:
-                        self.__on_error("Failed to connect after discovery")
-                        return
+                self.__on_error("Failed to connect after discovery")
+                return
         except Exception as e:
             logging.error(f"Connection failed with exception: {e}")
             self.__on_error(e)
@@ -103,106 +200,117 @@ class BaseClient:
             await self.ble_manager.disconnect()
 
     async def on_data_received(self, response):
-        # Cancel timeout task if it exists
-        if hasattr(self, 'read_timeout_task') and not self.read_timeout_task.done():
-            self.read_timeout_task.cancel()
-        operation = bytes_to_int(response, 1, 1)
+        operation = response[1] if len(response) > 1 else None
 
         if operation == READ_SUCCESS or operation == READ_ERROR:
-            if (operation == READ_SUCCESS and
-                self.section_index < len(self.sections) and
-                self.sections[self.section_index]['parser'] != None and
-                self.sections[self.section_index]['words'] * 2 + 5 == len(response)):
-                # call the parser and update data
-                logging.debug(f"on_data_received: read operation success")
-                self.__safe_parser(self.sections[self.section_index]['parser'], response)
-            else:
-                logging.warning(f"on_data_received: read operation failed: {response.hex()}")
-
-            if self.section_index >= len(self.sections) - 1: # last section, read complete
-                self.section_index = 0
-                self.on_read_operation_complete()
-                self.data = {}
-                await self.check_polling()
-            else:
-                self.section_index += 1
-                await asyncio.sleep(0.5)
-                await self.read_section()
+            # hand the response back to the read() loop awaiting this section
+            if self._section_future and not self._section_future.done():
+                self._section_future.set_result(response)
         else:
             logging.warning("on_data_received: unknown operation={}".format(operation))
 
     def on_read_operation_complete(self):
         logging.debug("on_read_operation_complete")
-        self.data['__device'] = self.config['device']['alias']
+        self.data['__device'] = self.alias
         self.data['__client'] = self.__class__.__name__
         self.__safe_callback(self.on_data_callback, self.data)
 
-    async def _check_timeout(self):
-        """Check for read timeout using high-level asyncio APIs."""
-        try:
-            await asyncio.sleep(READ_TIMEOUT)
-            logging.error("on_read_timeout => Timed out! Please check your device_id!")
-            self.__on_error("Read timeout")
-        except asyncio.CancelledError:
-            # Timeout was cancelled, which is normal
-            pass
+    def _on_disconnect(self):
+        logging.warning("BLE link dropped, reconnecting before next poll")
+        self._needs_reconnect = True
 
     async def check_polling(self):
-        if self.config['data'].getboolean('enable_polling'):
-            poll_interval = self.config['data'].getint('poll_interval')
-            await asyncio.sleep(poll_interval)
-            await self.read_section()
+        # iterative loop: the old read -> check_polling -> read tail call
+        # stacked a fresh coroutine frame per poll cycle, growing without
+        # bound on a long-running daemon
+        while self.polling_enabled and not (self._stop_event and self._stop_event.is_set()):
+            await asyncio.sleep(self.poll_interval)
+            if self._needs_reconnect or not (self.ble_manager.client and self.ble_manager.client.is_connected):
+                # reconnect only after a real drop; the cached BLEDevice skips rediscovery
+                self._needs_reconnect = False
+                await self.ble_manager.connect()
+            await self.read()
 
-    async def read_section(self):
-        try:
-            index = self.section_index
-            if self.device_id is None or len(self.sections) == 0:
-                logging.error("BaseClient cannot be used directly")
-                self.__on_error("BaseClient cannot be used directly")
+    async def read(self):
+        """Read and parse all sections once; polling is driven by check_polling."""
+        if self.device_id is None or len(self.sections) == 0:
+            logging.error("BaseClient cannot be used directly")
+            self.__on_error("BaseClient cannot be used directly")
+            return
+        self._prepare_sections()
+        for index, section in enumerate(self.sections):
+            if self._stop_event and self._stop_event.is_set():
                 return
+            if index > 0 and self._current_delay:
+                await asyncio.sleep(self._current_delay)
+            response = await self.read_section(section)
+            if response is None:
+                continue
+            if (response[1] == READ_SUCCESS and section['parser'] != None and
+                    section['words'] * 2 + 5 == len(response)):
+                # reject corrupt frames before they reach the parsers; the
+                # table-driven CRC costs one lookup per byte
+                if crc16_modbus(memoryview(response)[:-2]) != response[-2:]:
+                    logging.warning(f"read: crc mismatch, dropping frame: {response.hex()}")
+                    continue
+                # call the parser(s) and update data
+                logging.debug(f"read: read operation success")
+                self._parse_section(section, response)
+            else:
+                logging.warning(f"read: read operation failed: {response.hex()}")
+        self.on_read_operation_complete()
+        self.data = {}
 
-            # Start timeout task for read response
-            self.read_timeout_task = asyncio.create_task(
-                self._check_timeout()
-            )
-            request = self.create_generic_read_request(
-                self.device_id, 3, 
-                self.sections[index]['register'], 
-                self.sections[index]['words']
-            )
-            await self.ble_manager.characteristic_write_value(request)
+    async def read_section(self, section):
+        try:
+            self._section_future = asyncio.get_running_loop().create_future()
+            await self.ble_manager.characteristic_write_bytes(section['_frame'])
+            response = await asyncio.wait_for(self._section_future, READ_TIMEOUT)
+            self._had_read_success = True
+            self._successive_reads += 1
+            if (self._successive_reads >= DELAY_RECOVERY_READS
+                    and self._current_delay > self.inter_section_delay):
+                self._current_delay = max(self._current_delay / 2, self.inter_section_delay)
+                self._successive_reads = 0
+            return response
+        except asyncio.TimeoutError:
+            if not self._had_read_success:
+                # never got a single answer: almost certainly a config problem
+                logging.error("on_read_timeout => Timed out! Please check your device_id!")
+                self.__on_error("Read timeout")
+                return None
+            # the device answered before, so treat this as pacing: skip the
+            # section and widen the inter-command gap up to the old fixed 0.5s
+            self._successive_reads = 0
+            self._current_delay = min(max(self._current_delay * 2, DELAY_BACKOFF_MIN), DELAY_BACKOFF_CAP)
+            logging.warning(f"read_section: timed out, backing off inter-section delay to {self._current_delay:.2f}s")
+            return None
         except Exception as e:
             logging.error(f"Error in read_section: {e}")
             self.__on_error(e)
 
-    def create_generic_read_request(self, device_id, function, regAddr, readWrd):                             
-        data = None                                
+    def create_generic_read_request(self, device_id, function, regAddr, readWrd):
+        data = None
         if regAddr != None and readWrd != None:
-            data = []
-            data.append(device_id)
-            data.append(function)
-            data.append(int_to_bytes(regAddr, 0))
-            data.append(int_to_bytes(regAddr, 1))
-            data.append(int_to_bytes(readWrd, 0))
-            data.append(int_to_bytes(readWrd, 1))
-
-            crc = crc16_modbus(bytes(data))
-            data.append(crc[0])
-            data.append(crc[1])
-            logging.debug("{} {} => {}".format("create_request_payload", regAddr, data))
+            # single C-level pack instead of per-byte appends through int_to_bytes
+            header = _REQ_HEADER.pack(device_id, function, regAddr, readWrd)
+            data = header + crc16_modbus(header)
+            # hex-encoding the frame is pure debug aid; skip it unless asked for
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"create_request_payload {regAddr} => {data.hex()}")
         return data
 
     def __on_error(self, error=None):
         logging.error(f"Exception occured: {error}")
         self.__safe_callback(self.on_error_callback, error)
-        # With asyncio.run(), we can simply raise an exception to terminate
-        if error and str(error) not in ["KeyboardInterrupt"]:
-            raise RuntimeError(f"Client error: {error}")
+        # signal the structured shutdown path instead of raising through
+        # every coroutine between here and run()
+        self.stop()
 
     def __on_connect_fail(self, error):
         logging.error(f"Connection failed: {error}")
         self.__safe_callback(self.on_error_callback, error)
-        raise RuntimeError(f"Connection failed: {error}")
+        self.stop()
 
     def stop(self):
         """Stop the client and clean up resources."""
@@ -223,7 +331,10 @@ class BaseClient:
                 calback(self, param)
             except Exception as e:
                 logging.error(f"__safe_callback => exception in callback! {e}")
-                traceback.print_exc()
+                # formatting a full traceback per failure is costly; only
+                # pay for it when debug logging is actually enabled
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.exception("callback traceback")
 
     def __safe_parser(self, parser, param):
         if parser is not None:
@@ -231,4 +342,5 @@ class BaseClient:
                 parser(param)
             except Exception as e:
                 logging.error(f"exception in parser! {e}")
-                traceback.print_exc()
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.exception("parser traceback")
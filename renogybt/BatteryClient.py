@@ -1,5 +1,5 @@
 from .BaseClient import BaseClient
-from .Utils import bytes_to_int, format_temperature
+from .Utils import bytes_to_int, format_temperature, parse_words
 
 # Client for Renogy LFP battery with built-in bluetooth / BT-2 module
 
@@ -26,17 +26,19 @@ class BatteryClient(BaseClient):
         data = {}
         data['function'] = FUNCTION.get(bytes_to_int(bs, 1, 1))
         data['cell_count'] = bytes_to_int(bs, 3, 2)
-        for i in range(0, data['cell_count']):
-            data[f'cell_voltage_{i}'] = bytes_to_int(bs, 5 + i*2, 2, scale = 0.1)
+        # one unpack for all cells instead of a bytes_to_int call per cell
+        count = min(data['cell_count'], (len(bs) - 7) // 2)
+        data.update({f'cell_voltage_{i}': round(v * 0.1, 2) for i, v in enumerate(parse_words(bs, count, 5))})
         self.data.update(data)
 
     def parse_cell_temp_info(self, bs):
         data = {}
         data['function'] = FUNCTION.get(bytes_to_int(bs, 1, 1))
         data['sensor_count'] = bytes_to_int(bs, 3, 2)
-        for i in range(0, data['sensor_count']):
-            celcius = bytes_to_int(bs, 5 + i*2, 2, scale = 0.1, signed = True)
-            data[f'temperature_{i}'] = format_temperature(celcius, self.config['data']['temperature_unit'])
+        count = min(data['sensor_count'], (len(bs) - 7) // 2)
+        for i, raw in enumerate(parse_words(bs, count, 5)):
+            celcius = round((raw - 0x10000 if raw & 0x8000 else raw) * 0.1, 2)
+            data[f'temperature_{i}'] = format_temperature(celcius, self.temperature_unit)
         self.data.update(data)
 
     def parse_battery_info(self, bs):
@@ -53,7 +53,7 @@ class DCChargerClient(BaseClient):
 
     def parse_charging_info(self, bs):
         data = {}
-        temp_unit = self.config['data']['temperature_unit']
+        temp_unit = self.temperature_unit
         data['function'] = FUNCTION.get(bytes_to_int(bs, 1, 1))
         data['battery_percentage'] = bytes_to_int(bs, 3, 2)
         data['battery_voltage'] = bytes_to_int(bs, 5, 2, scale = 0.1)
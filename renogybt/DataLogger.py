@@ -1,7 +1,7 @@
+import asyncio
 import json
 import logging
 import requests
-import paho.mqtt.publish as publish
 from configparser import ConfigParser
 from datetime import datetime
 import numbers
@@ -11,82 +11,122 @@ PVOUTPUT_URL = 'http://pvoutput.org/service/r2/addstatus.jsp'
 class DataLogger:
     def __init__(self, config: ConfigParser):
         self.config = config
+        # one TCP/TLS connection reused across uploads instead of a fresh
+        # handshake per poll; the other sinks keep their clients lazily
+        self.session = requests.Session()
+        self.mqtt_client = None
+        self.influxdb2_write_api = None
+        self.influxdb3_client = None
+        self.tag_keys = ()
+        self.field_keys = ()
+        self._classified_keys = set()
+        # constant per process; don't rebuild a dict per upload
+        self.auth_headers = { "Authorization" : f"Bearer {self.config['remote_logging']['auth_header']}" } if config.has_section('remote_logging') else None
+        self.mqtt_topic = self.config['mqtt']['topic'] if config.has_section('mqtt') else None
+
+    async def log_all(self, json_data, sinks):
+        # fire all sinks concurrently so the total cost is the slowest RTT,
+        # not the sum; the blocking clients run in worker threads
+        results = await asyncio.gather(
+            *(asyncio.to_thread(sink, json_data) for sink in sinks),
+            return_exceptions=True
+        )
+        for sink, result in zip(sinks, results):
+            if isinstance(result, Exception):
+                logging.error(f"{sink.__name__} failed: {result}")
 
     def log_remote(self, json_data):
-        headers = { "Authorization" : f"Bearer {self.config['remote_logging']['auth_header']}" }
-        req = requests.post(self.config['remote_logging']['url'], json = json_data, timeout=15, headers=headers)
+        req = self.session.post(self.config['remote_logging']['url'], json = json_data, timeout=15, headers=self.auth_headers)
         logging.info("Log remote 200") if req.status_code == 200 else logging.error(f"Log remote error {req.status_code}")
 
+    def _get_mqtt_client(self):
+        if self.mqtt_client is None:
+            import paho.mqtt.client as mqtt
+            try:
+                client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id="renogy-bt")
+            except AttributeError:
+                client = mqtt.Client(client_id="renogy-bt") # paho-mqtt < 2.0
+            user = self.config['mqtt']['user']
+            password = self.config['mqtt']['password']
+            if user and password:
+                client.username_pw_set(user, password)
+            client.connect(self.config['mqtt']['server'], self.config['mqtt'].getint('port'))
+            client.loop_start() # network thread also handles auto-reconnect
+            self.mqtt_client = client
+        return self.mqtt_client
+
     def log_mqtt(self, json_data):
         logging.info(f"mqtt logging")
-        user = self.config['mqtt']['user']
-        password = self.config['mqtt']['password']
-        auth = None if not user or not password else {"username": user, "password": password}
-
-        publish.single(
-            self.config['mqtt']['topic'], payload=json.dumps(json_data),
-            hostname=self.config['mqtt']['server'], port=self.config['mqtt'].getint('port'),
-            auth=auth, client_id="renogy-bt"
-        )
+        self._get_mqtt_client().publish(self.mqtt_topic, payload=json.dumps(json_data))
 
     def log_pvoutput(self, json_data):
         date_time = datetime.now().strftime("d=%Y%m%d&t=%H:%M")
         data = f"{date_time}&v1={json_data['power_generation_today']}&v2={json_data['pv_power']}&v3={json_data['power_consumption_today']}&v4={json_data['load_power']}&v5={json_data['controller_temperature']}&v6={json_data['battery_voltage']}"
-        response = requests.post(PVOUTPUT_URL, data=data, headers={
+        response = self.session.post(PVOUTPUT_URL, data=data, headers={
             "Content-Type": "application/x-www-form-urlencoded",
             "X-Pvoutput-Apikey": self.config['pvoutput']['api_key'],
             "X-Pvoutput-SystemId":  self.config['pvoutput']['system_id']
         })
-        print(f"pvoutput {response}")
+        logging.info("pvoutput 200") if response.status_code == 200 else logging.error(f"pvoutput error {response.status_code}")
+
+    def _build_point(self, point_cls, section, json_data):
+        # classify each key as tag/field the first time it is seen: the slow
+        # isinstance check against the numbers.Number ABC runs once per key,
+        # not once per upload. Keys can appear late (EcoWorthy drops
+        # temperature while the sensor is disconnected), so unseen keys are
+        # appended to the cached tuples instead of being ignored forever
+        if not self._classified_keys >= json_data.keys():
+            tag_keys, field_keys = list(self.tag_keys), list(self.field_keys)
+            for key, value in json_data.items():
+                if key in self._classified_keys or value is None:
+                    continue
+                if isinstance(value, str):
+                    tag_keys.append(key)
+                elif isinstance(value, numbers.Number):
+                    field_keys.append(key)
+                else:
+                    logging.info(f"Ignoring key {key} with unsupported data type. Value: {value}")
+                self._classified_keys.add(key)
+            self.tag_keys = tuple(tag_keys)
+            self.field_keys = tuple(field_keys)
+
+        p = point_cls(self.config[section].get("measurement", "renogy"))
+        for key in self.tag_keys:
+            value = json_data.get(key)
+            if value is not None:
+                p = p.tag(key, value)
+        for key in self.field_keys:
+            value = json_data.get(key)
+            if value is not None:
+                p = p.field(key, value)
+        logging.debug(f"Point: {p}")
+        return p
 
     def log_influxdb2(self, json_data):
         from influxdb_client import InfluxDBClient, Point
         from influxdb_client.client.write_api import SYNCHRONOUS
-        
+
         logging.debug("influxdb2 logging")
-        url = self.config['influxdb2']['url']
-        token = self.config['influxdb2'].get('token', None)
-        org = self.config['influxdb2']['org']
         bucket = self.config['influxdb2']['bucket']
+        p = self._build_point(Point, 'influxdb2', json_data)
 
-        p = Point(self.config['influxdb2'].get("measurement", "renogy"))
-        for key, value in json_data.items():
-            if value is None:
-                continue
-            if isinstance(value, str):
-                p = p.tag(key, value)
-            elif isinstance(value, numbers.Number):
-                p = p.field(key, value)
-            else:
-                logging.info(f"Ignoring key {key} with unsupported data type. Value: {value}")
-
-        logging.debug(f"Point: {p}")
-
-        client = InfluxDBClient(url=url, token=token, org=org)
-        write_api = client.write_api(write_options=SYNCHRONOUS)
-        write_api.write(bucket=bucket, record=p)
+        if self.influxdb2_write_api is None:
+            url = self.config['influxdb2']['url']
+            token = self.config['influxdb2'].get('token', None)
+            org = self.config['influxdb2']['org']
+            client = InfluxDBClient(url=url, token=token, org=org)
+            self.influxdb2_write_api = client.write_api(write_options=SYNCHRONOUS)
+        self.influxdb2_write_api.write(bucket=bucket, record=p)
 
     def log_influxdb3(self, json_data):
         from influxdb_client_3 import InfluxDBClient3, Point
 
         logging.debug("influxdb3 logging")
-        host = self.config['influxdb3']['host']
-        token = self.config['influxdb3'].get('token', None)
-        database = self.config['influxdb3']['database']
-
-        p = Point(self.config['influxdb3'].get("measurement", "renogy"))
-        for key, value in json_data.items():
-            if value is None:
-                continue
-            if isinstance(value, str):
-                p = p.tag(key, value)
-            elif isinstance(value, numbers.Number):
-                p = p.field(key, value)
-            else:
-                logging.info(f"Ignoring key {key} with unsupported data type. Value: {value}")
-
-        logging.debug(f"Point: {p}")
-
-        with InfluxDBClient3(host=host, token=token, database=database) as client:
-            client.write(record=p)
-
+        p = self._build_point(Point, 'influxdb3', json_data)
+
+        if self.influxdb3_client is None:
+            host = self.config['influxdb3']['host']
+            token = self.config['influxdb3'].get('token', None)
+            database = self.config['influxdb3']['database']
+            self.influxdb3_client = InfluxDBClient3(host=host, token=token, database=database)
+        self.influxdb3_client.write(record=p)
@@ -1,12 +1,13 @@
 import asyncio
 import configparser
 import logging
-import traceback
+import struct
+import sys
 from .BLEManager import BLEManager
-from .Utils import bytes_to_int, crc16_modbus, format_temperature, int_to_bytes
+from .Utils import bytes_to_int, format_temperature
 
 
-ALIAS_PREFIXES = ['DP']
+ALIAS_PREFIXES = ('DP',) # tuple so startswith can take it directly
 WRITE_SERVICE_UUID = "0000ff00-0000-1000-8000-00805f9b34fb"
 NOTIFY_CHAR_UUID = "0000ff01-0000-1000-8000-00805f9b34fb"
 WRITE_CHAR_UUID  = "0000ff02-0000-1000-8000-00805f9b34fb"
@@ -18,23 +19,48 @@ OPERATION_BASIC_INFO = 3
 OPERATION_CELLV_INFO = 4
 FRAME_HEADER = b'\xDD'[0]
 FRAME_END = b'\x77'[0]
+_BASIC_INFO = struct.Struct('>HhHH') # voltage u16, current i16, remaining u16, capacity u16
+_TEMP = struct.Struct('>H') # first temperature sensor, 0.1 K units
+# interned so per-frame dict inserts hit the identity fast path on key compare
+_CELL_KEYS = tuple(sys.intern(f'voltage_cell{i}') for i in range(1, 65))
 
 
 class EcoWorthyClient:
+    # fixed attribute schema: drops the per-instance __dict__ and makes the
+    # attribute reads in the notification handler C-level descriptor lookups
+    __slots__ = (
+        'on_data_callback', 'on_error_callback', 'config', 'ble_manager', 'data',
+        'device_id', 'inter_section_delay', 'temperature_unit', '_temp_fn',
+        'read_cellv', 'polling_enabled', 'poll_interval',
+        'fetched_basics', 'fetched_cellv', 'frame', 'frame_mv', 'frame_off',
+        '_frame_future', '_stop_event', '_running',
+    )
+
     def __init__(self, config, on_data_callback=None, on_error_callback=None):
         self.on_data_callback = on_data_callback
         self.on_error_callback = on_error_callback
         self.config: configparser.ConfigParser = config
         self.ble_manager = None
-        self.device = None
-        self.poll_timer = None
-        self.read_timeout = None
         self.data = {}
+        # snapshot config into plain attributes; configparser access does a
+        # dict walk + type coercion per call, not something for the poll path
         self.device_id = self.config['device'].getint('device_id')
+        self.inter_section_delay = self.config['device'].getfloat('inter_section_delay_ms', fallback=0) / 1000.0
+        self.temperature_unit = self.config['data'].get('temperature_unit', 'C').strip()
+        # the unit is fixed for the session, so resolve the conversion once
+        self._temp_fn = format_temperature if self.temperature_unit == "F" else (lambda celsius: celsius)
+        self.read_cellv = self.config['data'].getboolean('read_cellv', fallback=False)
+        self.polling_enabled = self.config['data'].getboolean('enable_polling', fallback=False)
+        self.poll_interval = self.config['data'].getint('poll_interval', fallback=60)
         self.fetched_basics = False
         self.fetched_cellv = False
-        self.frame = None
-        self.read_timeout_task = None
+        # preallocated reassembly buffer: fragments are copied straight in at
+        # a running offset and parsers read through the memoryview, so a
+        # multi-fragment frame costs no reallocation and no slice copies
+        self.frame = bytearray(256)
+        self.frame_mv = memoryview(self.frame)
+        self.frame_off = 0
+        self._frame_future = None
         self._stop_event = None
         self._running = False
         logging.info(f"Init {self.__class__.__name__}: {self.config['device']['alias']} => {self.config['device']['mac_addr']}")
@@ -43,13 +69,17 @@ class EcoWorthyClient:
         """Start the client using high-level asyncio APIs."""
         try:
             # Use asyncio.run() for proper event loop management
-            asyncio.run(self._run_with_timeout())
+            asyncio.run(self.run())
         except KeyboardInterrupt:
             logging.warning("KeyboardInterrupt received")
             self.__on_error("KeyboardInterrupt")
         except Exception as e:
             self.__on_error(e)
-    
+
+    async def run(self):
+        """Async entry point, allows multiple clients to share one event loop."""
+        await self._run_with_timeout()
+
     async def _run_with_timeout(self):
         """Run the main task with timeout using high-level asyncio APIs."""
         try:
@@ -76,29 +106,27 @@ class EcoWorthyClient:
 
     async def connect(self):
         try:
-            self.ble_manager = BLEManager(mac_address=self.config['device']['mac_addr'], alias=self.config['device']['alias'], on_data=self.on_data_received, on_connect_fail=self.__on_connect_fail, notify_char_uuid=NOTIFY_CHAR_UUID, write_char_uuid=WRITE_CHAR_UUID, write_service_uuid=WRITE_SERVICE_UUID)
+            self.ble_manager = BLEManager(mac_address=self.config['device']['mac_addr'], alias=self.config['device']['alias'], on_data=self.on_data_received, on_connect_fail=self.__on_connect_fail, notify_char_uuid=NOTIFY_CHAR_UUID, write_char_uuid=WRITE_CHAR_UUID, write_service_uuid=WRITE_SERVICE_UUID, adapter=self.config['device'].get('adapter', 'hci0'), conn_interval_min=self.config['device'].getfloat('conn_interval_min', fallback=None), conn_interval_max=self.config['device'].getfloat('conn_interval_max', fallback=None))
+
+            # resolve the device with one scan window up front: the scanner
+            # stops at the target's first advertisement, and connecting by
+            # bare MAC would make bleak run a scan of its own anyway
+            await self.ble_manager.discover()
+
+            if not self.ble_manager.device:
+                logging.error(f"Device not found: {self.config['device']['alias']} => {self.config['device']['mac_addr']}, please check the details provided.")
+                candidate = next((dev for dev in self.ble_manager.discovered_devices if dev.name != None and dev.name.startswith(ALIAS_PREFIXES)), None)
+                if candidate:
+                    logging.info(f"Possible device found! ====> {candidate.name} > [{candidate.address}]")
+                self.__on_error("Device not found after discovery")
+                return
 
             await self.ble_manager.connect()
             if self.ble_manager.client and self.ble_manager.client.is_connected:
                 await self.fetch_next()
             else:
-                logging.warning("Was not able to connect to MAC prior to discover - going long route.")
-                await self.ble_manager.discover()
-
-                if not self.ble_manager.device:
-                    logging.error(f"Device not found: {self.config['device']['alias']} => {self.config['device']['mac_addr']}, please check the details provided.")
-                    for dev in self.ble_manager.discovered_devices:
-                        if dev.name != None and dev.name.startswith(tuple(ALIAS_PREFIXES)):
-                            logging.info(f"Possible device found! ====> {dev.name} > [{dev.address}]")
-                    self.__on_error("Device not found after discovery")
-                    return
-                else:
-                    await self.ble_manager.connect()
-                    if self.ble_manager.client and self.ble_manager.client.is_connected: 
-                        await self.fetch_next()
-                    else:
-                        self.__on_error("Failed to connect after discovery")
-                        return
+                self.__on_error("Failed to connect after discovery")
+                return
         except Exception as e:
             logging.error(f"Connection failed with exception: {e}")
             self.__on_error(e)
@@ -107,121 +135,139 @@ class EcoWorthyClient:
         if self.ble_manager:
             await self.ble_manager.disconnect()
 
+    def _grow_frame(self, size):
+        # rare: only when a frame exceeds the preallocated buffer
+        grown = bytearray(size)
+        grown[:self.frame_off] = self.frame_mv[:self.frame_off]
+        self.frame = grown
+        self.frame_mv = memoryview(grown)
+
     async def on_data_received(self, response):
-        # Cancel timeout task if it exists
-        if hasattr(self, 'read_timeout_task') and not self.read_timeout_task.done():
-            self.read_timeout_task.cancel()
         frame_len = len(response)
         frame_header = response[0]
         frame_end = response[-1]
 
-        if frame_header != FRAME_HEADER and self.frame:
-            self.frame += response
-            logging.debug(f"Adding {frame_len} bytes to existing frame.")
+        if frame_header != FRAME_HEADER and self.frame_off:
+            end = self.frame_off + frame_len
+            if end > len(self.frame):
+                self._grow_frame(end)
+            self.frame_mv[self.frame_off:end] = response
+            self.frame_off = end
+            logging.debug("Adding %d bytes to existing frame.", frame_len)
         elif frame_header == FRAME_HEADER:
-            operation = bytes_to_int(response, 1, 1)
-            status = bytes_to_int(response, 2, 1)
-            data_length = bytes_to_int(response, 3, 1)
-            self.frame = response
-            logging.debug(f"Received new frame, frame header: {frame_header}, operation: {operation}, status: {status}, data length: {data_length}, frame length: {frame_len}")
+            operation = response[1]
+            status = response[2]
+            data_length = response[3]
+            # header(4) + data + checksum(2) + end(1)
+            expected = 4 + data_length + 3
+            if max(expected, frame_len) > len(self.frame):
+                self._grow_frame(max(expected, frame_len))
+            self.frame_mv[:frame_len] = response
+            self.frame_off = frame_len
+            # %-style args so the string is only built if a handler wants it
+            logging.debug("Received new frame, frame header: %d, operation: %d, status: %d, data length: %d, frame length: %d", frame_header, operation, status, data_length, frame_len)
 
         if frame_end == FRAME_END:
-            operation = bytes_to_int(self.frame, 1, 1)
-            data_length = bytes_to_int(self.frame, 3, 1)
-            payload = self.frame[4:-3]
-            logging.debug(f"Payload size is {len(payload)}, expecting {data_length}")
+            operation = self.frame[1]
+            data_length = self.frame[3]
+            payload = self.frame_mv[4:self.frame_off - 3]
+            logging.debug("Payload size is %d, expecting %d", len(payload), data_length)
             if operation == OPERATION_BASIC_INFO:
 
-                data = {}
-                data['voltage'] = bytes_to_int(payload, 0, 2, signed=False, scale=0.01)
-                data['current'] = bytes_to_int(payload, 2, 2, signed=True, scale=0.01)
-                data['capacity_remaining'] = bytes_to_int(payload, 4, 2, signed=False, scale=0.01)
-                data['capacity'] = bytes_to_int(payload, 4, 2, signed=False, scale=0.01)
-                data['temperature'] = bytes_to_int(payload, 23, 2, signed=False, scale=0.1) - 273.1
-                temp_unit = self.config['data']['temperature_unit'].strip()
-                if temp_unit == "F":
-                    data['temperature'] = format_temperature(data['temperature'])
-                data['power'] = data['voltage'] * data['current']
-                data['percentage'] = 0 if data['capacity'] == 0 else 100.0 * data['capacity_remaining'] / data['capacity']
-
-                self.data.update(data)
+                # one C-level unpack per frame instead of a bytes_to_int call
+                # per field; derived values come straight from the raw ints
+                volt_raw, current_raw, remaining_raw, capacity_raw = _BASIC_INFO.unpack_from(payload, 0)
+                temp_raw = _TEMP.unpack_from(payload, 23)[0] if len(payload) >= 25 else 0
+                # write straight into self.data: the callback only fires once
+                # all frames are in, so no one observes a partial dict
+                data = self.data
+                data['voltage'] = round(volt_raw * 0.01, 2)
+                data['current'] = round(current_raw * 0.01, 2)
+                # nominal capacity sits at offset 6; it was read from offset 4
+                # like the remaining charge before, pinning percentage to 100
+                data['capacity_remaining'] = round(remaining_raw * 0.01, 2)
+                data['capacity'] = round(capacity_raw * 0.01, 2)
+                if temp_raw != 0xFFFF:
+                    data['temperature'] = self._temp_fn(round(temp_raw * 0.1, 2) - 273.1)
+                else:
+                    # 0xFFFF means "sensor disconnected"; don't publish 6280 degrees
+                    data.pop('temperature', None)
+                data['power'] = volt_raw * current_raw * 1e-4
+                data['percentage'] = 0 if capacity_raw == 0 else 100.0 * remaining_raw / capacity_raw
+
                 self.fetched_basics = True
-                await self.fetch_next()
+                self._resolve_frame()
             elif operation == OPERATION_CELLV_INFO:
 
-                data = {}
-                no_cells = int(data_length / 2)
-                for cell in range(1, no_cells+1):
-                    data[f'voltage_cell{cell}'] = bytes_to_int(payload, 2*(cell-1), 2, signed=False, scale=0.001)
-
-                self.data.update(data)
+                no_cells = min(int(data_length / 2), len(payload) // 2)
+                cells = struct.unpack_from(f'>{no_cells}H', payload, 0)
+                self.data.update(zip(_CELL_KEYS, (round(v * 0.001, 2) for v in cells)))
                 self.fetched_cellv = True
-                await self.fetch_next()
+                self._resolve_frame()
             else:
                 logging.warning("on_data_received: unknown operation={}".format(operation))
-            self.frame = None
+            self.frame_off = 0
         else:
             logging.debug("Still waiting for frame end.")
 
+    def _resolve_frame(self):
+        # hand control back to the fetch_next loop awaiting this frame
+        if self._frame_future and not self._frame_future.done():
+            self._frame_future.set_result(None)
+
+    async def _read_frame(self, command):
+        # awaiting a plain future under wait_for costs no extra task or timer
+        # per read; an unanswered command simply times the future out
+        self._frame_future = asyncio.get_running_loop().create_future()
+        await self.ble_manager.characteristic_write_bytes(command)
+        await asyncio.wait_for(self._frame_future, READ_TIMEOUT)
+
     async def fetch_next(self):
         try:
-            await asyncio.sleep(0.5)
-
-            if not self.fetched_basics:
-                # Start timeout task for read response
-                self.read_timeout_task = asyncio.create_task(
-                    self._check_timeout()
-                )
-                await self.ble_manager.characteristic_write_bytes(
-                    COMMAND_READ_BASIC
-                )
-            elif not self.fetched_cellv and self.config["data"].get("read_cellv"):
-                # Start timeout task for read response  
-                self.read_timeout_task = asyncio.create_task(
-                    self._check_timeout()
-                )
-                await self.ble_manager.characteristic_write_bytes(
-                    COMMAND_READ_CELLV
-                )
-            else:
-                # all done!
-                self.__safe_callback(self.on_data_callback, self.data)
-                # and reset in case this is running in a loop
-                self.fetched_basics = False
-                self.fetched_cellv = False
-                self.data = {}
-                await self.check_polling()
+            while not (self._stop_event and self._stop_event.is_set()):
+                if self.inter_section_delay:
+                    await asyncio.sleep(self.inter_section_delay)
+
+                if not self.fetched_basics:
+                    await self._read_frame(COMMAND_READ_BASIC)
+                elif not self.fetched_cellv and self.read_cellv:
+                    await self._read_frame(COMMAND_READ_CELLV)
+                else:
+                    # all done!
+                    self.__safe_callback(self.on_data_callback, self.data)
+                    # and reset in case this is running in a loop
+                    self.fetched_basics = False
+                    self.fetched_cellv = False
+                    self.data = {}
+                    if not await self.check_polling():
+                        return
+        except asyncio.TimeoutError:
+            logging.error("on_read_timeout => Timed out! Please check your device_id!")
+            self.__safe_callback(self.on_error_callback, "Read timeout")
+            if self._stop_event:
+                self._stop_event.set()
         except Exception as e:
             logging.error(f"Error in fetch_next: {e}")
             self.__on_error(e)
 
-    async def _check_timeout(self):
-        """Check for read timeout using high-level asyncio APIs."""
-        try:
-            await asyncio.sleep(READ_TIMEOUT)
-            logging.error("on_read_timeout => Timed out! Please check your device_id!")
-            self.__on_error("Read timeout")
-        except asyncio.CancelledError:
-            # Timeout was cancelled, which is normal
-            pass
-
     async def check_polling(self):
-        if self.config['data'].getboolean('enable_polling'):
-            poll_interval = self.config['data'].getint('poll_interval')
-            await asyncio.sleep(poll_interval)
-            await self.fetch_next()
+        """Sleep out the polling interval; returns False when polling is off."""
+        if not self.polling_enabled:
+            return False
+        await asyncio.sleep(self.poll_interval)
+        return True
 
     def __on_error(self, error=None):
         logging.error(f"Exception occured: {error}")
         self.__safe_callback(self.on_error_callback, error)
-        # With asyncio.run(), we can simply raise an exception to terminate
-        if error and str(error) not in ["KeyboardInterrupt"]:
-            raise RuntimeError(f"Client error: {error}")
+        # signal the structured shutdown path instead of raising through
+        # every coroutine between here and run()
+        self.stop()
 
     def __on_connect_fail(self, error):
         logging.error(f"Connection failed: {error}")
         self.__safe_callback(self.on_error_callback, error)
-        raise RuntimeError(f"Connection failed: {error}")
+        self.stop()
 
     def stop(self):
         """Stop the client and clean up resources."""
@@ -242,4 +288,5 @@ class EcoWorthyClient:
                 calback(self, param)
             except Exception as e:
                 logging.error(f"__safe_callback => exception in callback! {e}")
-                traceback.print_exc()
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.exception("callback traceback")
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from .BaseClient import BaseClient
-from .Utils import bytes_to_int, parse_temperature
+from .Utils import bytes_to_int, parse_temperature, parse_words
 
 # Read and parse BT-1/BT-2 type bluetooth modules connected to Renogy Rover/Wanderer/Adventurer
 
@@ -48,7 +48,7 @@ class RoverClient(BaseClient):
         self.set_load_params = {'function': 6, 'register': 266}
 
     async def on_data_received(self, response):
-        operation = bytes_to_int(response, 1, 1)
+        operation = response[1] if len(response) > 1 else None
         if operation == 6: # write operation
             self.parse_set_load_response(response)
             self.on_write_operation_complete()
@@ -65,7 +65,7 @@ class RoverClient(BaseClient):
     def set_load(self, value = 0):
         logging.info("setting load {}".format(value))
         request = self.create_generic_read_request(self.device_id, self.set_load_params["function"], self.set_load_params["register"], value)
-        asyncio.create_task(self.ble_manager.characteristic_write_value(request))
+        asyncio.create_task(self.ble_manager.characteristic_write_bytes(request))
 
     def parse_device_info(self, bs):
         data = {}
@@ -80,28 +80,31 @@ class RoverClient(BaseClient):
 
     def parse_chargin_info(self, bs):
         data = {}
-        temp_unit = self.config['data']['temperature_unit']
-        data['function'] = FUNCTION.get(bytes_to_int(bs, 1, 1))
-        data['battery_percentage'] = bytes_to_int(bs, 3, 2)
-        data['battery_voltage'] = bytes_to_int(bs, 5, 2, scale = 0.1)
-        data['battery_current'] = bytes_to_int(bs, 7, 2, scale = 0.01)
-        data['battery_temperature'] = parse_temperature(bytes_to_int(bs, 10, 1), temp_unit)
-        data['controller_temperature'] = parse_temperature(bytes_to_int(bs, 9, 1), temp_unit)
-        data['load_status'] = LOAD_STATE.get(bytes_to_int(bs, 67, 1) >> 7)
-        data['load_voltage'] = bytes_to_int(bs, 11, 2, scale = 0.1)
-        data['load_current'] = bytes_to_int(bs, 13, 2, scale = 0.01)
-        data['load_power'] = bytes_to_int(bs, 15, 2)
-        data['pv_voltage'] = bytes_to_int(bs, 17, 2, scale = 0.1) 
-        data['pv_current'] = bytes_to_int(bs, 19, 2, scale = 0.01)
-        data['pv_power'] = bytes_to_int(bs, 21, 2)
-        data['max_charging_power_today'] = bytes_to_int(bs, 33, 2)
-        data['max_discharging_power_today'] = bytes_to_int(bs, 35, 2)
-        data['charging_amp_hours_today'] = bytes_to_int(bs, 37, 2)
-        data['discharging_amp_hours_today'] = bytes_to_int(bs, 39, 2)
-        data['power_generation_today'] = bytes_to_int(bs, 41, 2)
-        data['power_consumption_today'] = bytes_to_int(bs, 43, 2)
-        data['power_generation_total'] = bytes_to_int(bs, 59, 4)
-        data['charging_status'] = CHARGING_STATE.get(bytes_to_int(bs, 68, 1))
+        temp_unit = self.temperature_unit
+        # decode the whole register block in one C-level unpack instead of
+        # ~20 separate bytes_to_int slice-and-convert calls per poll
+        words = parse_words(bs, 30)
+        data['function'] = FUNCTION.get(bs[1])
+        data['battery_percentage'] = words[0]
+        data['battery_voltage'] = round(words[1] * 0.1, 2)
+        data['battery_current'] = round(words[2] * 0.01, 2)
+        data['battery_temperature'] = parse_temperature(bs[10], temp_unit)
+        data['controller_temperature'] = parse_temperature(bs[9], temp_unit)
+        data['load_status'] = LOAD_STATE.get(bs[67] >> 7)
+        data['load_voltage'] = round(words[4] * 0.1, 2)
+        data['load_current'] = round(words[5] * 0.01, 2)
+        data['load_power'] = words[6]
+        data['pv_voltage'] = round(words[7] * 0.1, 2)
+        data['pv_current'] = round(words[8] * 0.01, 2)
+        data['pv_power'] = words[9]
+        data['max_charging_power_today'] = words[15]
+        data['max_discharging_power_today'] = words[16]
+        data['charging_amp_hours_today'] = words[17]
+        data['discharging_amp_hours_today'] = words[18]
+        data['power_generation_today'] = words[19]
+        data['power_consumption_today'] = words[20]
+        data['power_generation_total'] = (words[28] << 16) | words[29]
+        data['charging_status'] = CHARGING_STATE.get(bs[68])
         self.data.update(data)
 
     def parse_battery_type(self, bs):
@@ -9,7 +9,7 @@ import configparser
 import os
 import sys
 import asyncio
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from renogybt import EcoWorthyClient, BatteryClient, RoverClient
 
 logging.basicConfig(level=logging.INFO)
@@ -77,27 +77,29 @@ def test_timeout_scenario():
     with patch('renogybt.EcoWorthyClient.BLEManager') as mock_ble_manager:
         mock_instance = Mock()
         mock_ble_manager.return_value = mock_instance
-        
+
+        # Discovery succeeds immediately and "finds" the device
+        def discovery_found_device():
+            mock_instance.device = Mock()
+        mock_instance.discover = AsyncMock(side_effect=discovery_found_device)
+        mock_instance.disconnect = AsyncMock()
+
         # Make connect hang by never completing
         async def hanging_connect():
             await asyncio.sleep(100)  # Simulate hanging connection
-            
+
         mock_instance.connect = hanging_connect
-        
+
         client = EcoWorthyClient(test_config, None, None)
-        
+
         import time
         start_time = time.time()
-        
-        try:
-            client.start()
-        except RuntimeError as e:
-            # New behavior: RuntimeError is raised for timeout
-            logging.info(f"RuntimeError (expected): {e}")
-        except Exception as e:
-            logging.info(f"Other exception: {e}")
-        
-        end_time = time.time() 
+
+        # Errors are reported via the callbacks and the stop event, so
+        # start() returns normally after the application timeout fires
+        client.start()
+
+        end_time = time.time()
         duration = end_time - start_time
         
         print(f"Timeout test completed in {duration:.2f} seconds")
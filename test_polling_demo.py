@@ -5,100 +5,119 @@ Demo script to test the polling functionality with a mock client
 
 import asyncio
 import logging
-import configparser
+import signal
+from types import MappingProxyType
+
+try:
+    import uvloop # drop-in Cython event loop, 2-4x faster; optional
+except ImportError:
+    uvloop = None
 
 logging.basicConfig(level=logging.INFO)
 
+# one logger instance: filter dispatch is a single level check, not a walk
+log = logging.getLogger(__name__)
+
+# plain frozen mapping built once at import; dict lookups skip ConfigParser's
+# section copies and string interpolation entirely
+CONFIG = MappingProxyType({
+    'device': MappingProxyType({'alias': 'MockDevice'}),
+    'data': MappingProxyType({'enable_polling': True, 'poll_interval': 2}),
+})
+
 class MockClient:
     """Mock client to demonstrate the fixed async behavior"""
     
     def __init__(self, config):
         self.config = config
-        self._stop_event = None
+        # read once here, like the real clients snapshot their config
+        self._poll_interval = float(config['data'].get('poll_interval', 2))
+        # reused every tick; only the varying fields are rewritten
+        self._mock_data = {'voltage': 12.5, 'current': 5.2, 'power': 65.0, 'count': 0}
+        self._stop_future = None
+        self._data_ready = None
+        self._loop = None
         self._running = False
         self.data_count = 0
         
     def start(self):
         """Start the mock client"""
         try:
-            asyncio.run(self._run_with_timeout())
-        except KeyboardInterrupt:
-            logging.info("KeyboardInterrupt received - stopping gracefully")
+            if uvloop is not None:
+                uvloop.install()
+            asyncio.run(self._main_task())
         except Exception as e:
-            logging.error(f"Error: {e}")
-    
-    async def _run_with_timeout(self):
-        """Run the main task with timeout"""
-        try:
-            await asyncio.wait_for(self._main_task(), timeout=30.0)
-        except asyncio.TimeoutError:
-            logging.error("Demo timeout after 30 seconds")
-        except Exception as e:
-            logging.error(f"Error in main task: {e}")
+            log.error("Error: %s", e)
     
     async def _main_task(self):
         """Main async task - demonstrates the fix"""
         self._running = True
-        self._stop_event = asyncio.Event()
-        
+        # resolve the loop once and schedule through it directly from here on
+        self._loop = loop = asyncio.get_running_loop()
+        # a future is the cheapest single-shot signal: set once, awaited once
+        self._stop_future = loop.create_future()
+        self._data_ready = asyncio.Event()
+        # demo cap rides the normal stop path: timeout and user stop are the
+        # same deadline-driven shutdown, no outer wrapper task needed
+        deadline = loop.call_later(30.0, self.stop)
+        # Ctrl-C/TERM become a clean stop() instead of an exception ripping
+        # through whichever await happens to be blocked
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.stop)
+            loop.add_signal_handler(signal.SIGTERM, self.stop)
+        except NotImplementedError:
+            pass # not supported on Windows event loops
+
         try:
             # Simulate connection
-            logging.info("Mock client: Connecting...")
+            log.info("Mock client: Connecting...")
             await asyncio.sleep(1)
-            logging.info("Mock client: Connected successfully!")
-            
-            # Start the polling loop
-            await self._start_polling()
-            
-            # Keep running until stopped
-            logging.info("Mock client: Waiting for stop signal...")
-            await self._stop_event.wait()
+            log.info("Mock client: Connected successfully!")
             
+            # Run the polling loop and the stop signal as one awaitable:
+            # whichever finishes first wins, and the other is cancelled
+            # instead of lingering as an orphan task
+            log.info("Mock client: Waiting for stop signal...")
+            poll = loop.create_task(self._poll_data())
+            done, pending = await asyncio.wait({poll, self._stop_future}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+
         finally:
-            logging.info("Mock client: Cleaning up...")
+            deadline.cancel()
+            log.info("Mock client: Cleaning up...")
             self._running = False
-    
-    async def _start_polling(self):
-        """Start the polling task"""
-        asyncio.create_task(self._poll_data())
-    
+
     async def _poll_data(self):
         """Simulate polling data from device"""
         while self._running:
-            await asyncio.sleep(2)  # Poll every 2 seconds
+            # event-driven wakeup: a real device would set _data_ready from its
+            # notification callback; the timer here just emulates that interrupt
+            self._loop.call_later(self._poll_interval, self._data_ready.set)
+            await self._data_ready.wait()
+            self._data_ready.clear()
             self.data_count += 1
             
             # Simulate receiving data
-            mock_data = {
-                'voltage': 12.5 + (self.data_count * 0.1),
-                'current': 5.2,
-                'power': 65.0,
-                'count': self.data_count
-            }
-            
-            logging.info(f"Mock data received: {mock_data}")
+            mock_data = self._mock_data
+            mock_data['voltage'] = 12.5 + (self.data_count * 0.1)
+            mock_data['count'] = self.data_count
+
+            log.info("Mock data received: %s", mock_data)
             
             # Stop after 5 data points to demonstrate
             if self.data_count >= 5:
-                logging.info("Demo complete - stopping client")
+                log.info("Demo complete - stopping client")
                 self.stop()
-                break
+                return
     
     def stop(self):
         """Stop the client"""
-        if self._running and self._stop_event:
-            logging.info("Mock client: Stop requested")
-            self._stop_event.set()
+        if self._running and self._stop_future and not self._stop_future.done():
+            log.info("Mock client: Stop requested")
+            self._stop_future.set_result(None)
 
 if __name__ == "__main__":
-    # Create a mock config
-    config = configparser.ConfigParser()
-    config.add_section('device')
-    config.set('device', 'alias', 'MockDevice')
-    config.add_section('data')
-    config.set('data', 'enable_polling', 'true')
-    config.set('data', 'poll_interval', '2')
-    
     print("=== Mock Client Demo ===")
     print("This demonstrates the fixed async behavior:")
     print("- Event loop stays alive")
@@ -108,7 +127,7 @@ if __name__ == "__main__":
     print()
     
     # Start the mock client
-    mock_client = MockClient(config)
+    mock_client = MockClient(CONFIG)
     mock_client.start()
     
     print("\nDemo completed successfully!")